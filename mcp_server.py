@@ -7,10 +7,15 @@ No GitHub token required! Works with public API.
 """
 
 import os
-import json
 import asyncio
+import functools
+import re
+import time
 from typing import Any, Optional
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # MCP Server imports (install: pip install mcp)
 try:
@@ -29,39 +34,143 @@ GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")  # Optional!
 # Create MCP server
 server = Server("openstar-memory")
 
+# Sessions keep connections alive across tool calls; memoizing per token
+# also bakes the invariant Accept/Authorization headers in once instead of
+# rebuilding the header dict on every fetch
+@functools.lru_cache(maxsize=16)
+def _session_for(token: str) -> requests.Session:
+    """Preconfigured session for one token ('' means unauthenticated)"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+    ))
+    session.headers["Accept"] = "application/vnd.github.star+json"
+    # Explicitly request compressed bodies - star pages gzip ~3-5x smaller
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    if token:
+        session.headers["Authorization"] = f"token {token}"
+    return session
+
+@functools.lru_cache(maxsize=64)
+def _url_for(username: str) -> str:
+    """Starred-repos endpoint for one user"""
+    return f"https://api.github.com/users/{username}/starred"
+
+# Raw-response cache: (username, limit) -> (monotonic timestamp, etag, body bytes).
+# Within the TTL we skip the HTTP round-trip entirely; after it, the stored
+# ETag turns the refetch into a 304 that is free of rate-limit cost and body.
+_CACHE: dict[tuple[str, int], tuple[float, Optional[str], bytes]] = {}
+_CACHE_TTL = 60.0  # seconds
+# search_any_user_stars keys this on caller-supplied usernames, so cap it -
+# a long-running server would otherwise retain body bytes for every user
+# ever queried
+_CACHE_MAX_ENTRIES = 64
+
+def _prune_cache(now: float) -> None:
+    """Drop expired entries, then the oldest ones beyond the size cap"""
+    for key in [key for key, entry in _CACHE.items() if now - entry[0] >= _CACHE_TTL]:
+        del _CACHE[key]
+    while len(_CACHE) >= _CACHE_MAX_ENTRIES:
+        del _CACHE[min(_CACHE, key=lambda key: _CACHE[key][0])]
+
+def _fetch_starred_bytes(username: str, limit: int, token: Optional[str] = None) -> bytes:
+    """Fetch the raw starred-repos response body, with TTL + ETag caching"""
+    key = (username, limit)
+    cached = _CACHE.get(key)
+
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[2]
+
+    # Only the conditional header varies per call; Accept/Authorization
+    # live on the cached session
+    headers = {}
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+
+    response = _session_for(token or "").get(
+        _url_for(username),
+        params={"per_page": limit},
+        headers=headers
+    )
+
+    # 304: unchanged since last fetch (and not counted against the quota)
+    if response.status_code == 304 and cached:
+        _CACHE[key] = (time.monotonic(), cached[1], cached[2])
+        return cached[2]
+
+    if response.status_code != 200:
+        return b""
+
+    now = time.monotonic()
+    _prune_cache(now)
+    _CACHE[key] = (now, response.headers.get("ETag"), response.content)
+    return response.content
+
+# Precompiled per-repo output templates - the template parse happens once
+# at import instead of per f-string per iteration
+_REPO_TPL = "**{full_name}**\n⭐ {stargazers_count} | {language}\n{description}\n🔗 {html_url}\n\n"
+_RECENT_TPL = "**{full_name}** (Starred: {starred_at})\n⭐ {stargazers_count} | {language}\n{description}\n🔗 {html_url}\n\n"
+
+_REPO_DEFAULTS = {
+    "full_name": None,
+    "stargazers_count": 0,
+    "language": "Unknown",
+    "description": "No description",
+    "html_url": None
+}
+
+def _render_repo(item: dict, template: str = _REPO_TPL) -> str:
+    """Render one starred item through a shared output template"""
+    repo = item.get("repo", item)
+    row = {key: repo.get(key, default) for key, default in _REPO_DEFAULTS.items()}
+    row["starred_at"] = item.get("starred_at", "Unknown")
+    return template.format_map(row)
+
 def fetch_starred_repos(username: str, query: str = "", limit: int = 10, token: Optional[str] = None) -> list:
     """Fetch starred repositories matching query"""
     if not username:
         return []
-    
-    headers = {
-        "Accept": "application/vnd.github.star+json"
-    }
-    
-    # Add token if provided (for higher rate limits)
-    if token:
-        headers["Authorization"] = f"token {token}"
-    
-    url = f"https://api.github.com/users/{username}/starred?per_page={limit}"
-    
+
     try:
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
+        content = _fetch_starred_bytes(username, limit, token)
+
+        if not content:
             return []
-        
-        repos = response.json()
-        
-        # Filter by query if provided
+
+        # Raw-bytes prefilter: if the query never appears anywhere in the
+        # body, no record can match - skip the JSON decode entirely. Only
+        # sound for ASCII queries with no JSON-escaped chars (bytes.lower()
+        # folds ASCII only, and '"'/'\\' appear escaped in the raw body);
+        # anything else falls through to the structured filter below
+        if (
+            query
+            and query.isascii()
+            and '"' not in query
+            and "\\" not in query
+            and query.lower().encode() not in content.lower()
+        ):
+            return []
+
+        repos = orjson.loads(content)
+
+        # Filter by query if provided - one compiled case-insensitive search
+        # over a single joined haystack instead of three .lower() passes
         if query:
-            query_lower = query.lower()
-            repos = [
-                r for r in repos
-                if query_lower in r.get("repo", r).get("full_name", "").lower()
-                or query_lower in (r.get("repo", r).get("description", "") or "").lower()
-                or any(query_lower in topic.lower() for topic in r.get("repo", r).get("topics", []))
-            ]
-        
+            query_re = re.compile(re.escape(query), re.IGNORECASE)
+            matched = []
+            for item in repos:
+                repo = item.get("repo", item)
+                haystack = (
+                    f"{repo.get('full_name', '')}\n"
+                    f"{repo.get('description') or ''}\n"
+                    f"{' '.join(repo.get('topics', ()))}"
+                )
+                if query_re.search(haystack):
+                    matched.append(item)
+            repos = matched
+
         return repos
     except Exception as e:
         print(f"Error fetching repos: {e}")
@@ -147,17 +256,11 @@ async def handle_call_tool(
         
         repos = fetch_starred_repos(GITHUB_USERNAME, query=query, limit=limit, token=GITHUB_TOKEN)
         
-        result = f"Found {len(repos)} starred repositories matching '{query}' for @{GITHUB_USERNAME}:\n\n"
-        
-        for item in repos:
-            repo = item.get("repo", item)
-            result += f"**{repo.get('full_name')}**\n"
-            result += f"⭐ {repo.get('stargazers_count', 0)} | {repo.get('language', 'Unknown')}\n"
-            result += f"{repo.get('description', 'No description')}\n"
-            result += f"🔗 {repo.get('html_url')}\n\n"
-        
-        return [types.TextContent(type="text", text=result)]
-    
+        parts = [f"Found {len(repos)} starred repositories matching '{query}' for @{GITHUB_USERNAME}:\n\n"]
+        parts.extend(_render_repo(item) for item in repos)
+
+        return [types.TextContent(type="text", text="".join(parts))]
+
     elif name == "get_recent_stars":
         limit = arguments.get("limit", 10)
         
@@ -169,17 +272,10 @@ async def handle_call_tool(
         
         repos = fetch_starred_repos(GITHUB_USERNAME, limit=limit, token=GITHUB_TOKEN)
         
-        result = f"{len(repos)} most recently starred repositories for @{GITHUB_USERNAME}:\n\n"
-        
-        for item in repos:
-            repo = item.get("repo", item)
-            starred_at = item.get("starred_at", "Unknown")
-            result += f"**{repo.get('full_name')}** (Starred: {starred_at})\n"
-            result += f"⭐ {repo.get('stargazers_count', 0)} | {repo.get('language', 'Unknown')}\n"
-            result += f"{repo.get('description', 'No description')}\n"
-            result += f"🔗 {repo.get('html_url')}\n\n"
-        
-        return [types.TextContent(type="text", text=result)]
+        parts = [f"{len(repos)} most recently starred repositories for @{GITHUB_USERNAME}:\n\n"]
+        parts.extend(_render_repo(item, _RECENT_TPL) for item in repos)
+
+        return [types.TextContent(type="text", text="".join(parts))]
     
     elif name == "search_any_user_stars":
         username = arguments.get("username", "")
@@ -194,16 +290,10 @@ async def handle_call_tool(
         
         repos = fetch_starred_repos(username, query=query, limit=limit, token=GITHUB_TOKEN)
         
-        result = f"Found {len(repos)} starred repositories matching '{query}' for @{username}:\n\n"
-        
-        for item in repos:
-            repo = item.get("repo", item)
-            result += f"**{repo.get('full_name')}**\n"
-            result += f"⭐ {repo.get('stargazers_count', 0)} | {repo.get('language', 'Unknown')}\n"
-            result += f"{repo.get('description', 'No description')}\n"
-            result += f"🔗 {repo.get('html_url')}\n\n"
-        
-        return [types.TextContent(type="text", text=result)]
+        parts = [f"Found {len(repos)} starred repositories matching '{query}' for @{username}:\n\n"]
+        parts.extend(_render_repo(item) for item in repos)
+
+        return [types.TextContent(type="text", text="".join(parts))]
     
     else:
         raise ValueError(f"Unknown tool: {name}")
@@ -10,13 +10,60 @@ Modes:
 """
 
 import os
-import json
 import base64
+import hashlib
 import subprocess
 import re
+import time
+import asyncio
+import concurrent.futures
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+
+# orjson (a C extension) parses 2-5x faster than stdlib json; fall back
+# to the stdlib when it isn't installed
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Max concurrent page fetches (stays under GitHub's secondary rate limit)
+MAX_CONCURRENT_FETCHES = 8
+
+# Shared session: keep-alive avoids a TCP+TLS handshake per request.
+# GitHub and Supermemory use different auth headers, so those stay per-call.
+# Retry's default allowed_methods covers only idempotent verbs, so these
+# retries apply to the GitHub GETs - POSTs go out exactly once.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+# Explicitly request compressed bodies - star pages gzip ~3-5x smaller
+SESSION.headers["Accept-Encoding"] = "gzip, deflate"
+
+# Matches owner/repo in both SSH and HTTPS GitHub remote URLs; the
+# non-greedy repo group lets the optional .git suffix actually match
+_REMOTE_RE = re.compile(r'github\.com[:/]([^/]+)/([^/.]+?)(?:\.git)?$')
 
 # Configuration from environment
 GITHUB_USERNAME = os.environ.get("GITHUB_USERNAME", "")
@@ -24,9 +71,14 @@ GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")  # Optional!
 SUPERMEMORY_API_KEY = os.environ.get("SUPERMEMORY_API_KEY", "")
 SUPERMEMORY_API_URL = os.environ.get("SUPERMEMORY_API_URL", "https://api.supermemory.ai/api/v1")
 
+# One timestamp per run - the markdown header and commit message should
+# agree anyway, and it saves a utcnow() call per use
+RUN_TS = datetime.utcnow()
+
 def log(msg: str):
     """Timestamped logging"""
-    print(f"[{datetime.utcnow().isoformat()}] {msg}")
+    # time.strftime on gmtime avoids a datetime allocation per log line
+    print(f"[{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())}] {msg}")
 
 def get_repo_info() -> Optional[Tuple[str, str]]:
     """Auto-detect repo owner and name from git remote"""
@@ -40,18 +92,13 @@ def get_repo_info() -> Optional[Tuple[str, str]]:
         )
         remote_url = result.stdout.strip()
         
-        # Parse owner/repo from various GitHub URL formats
-        patterns = [
-            r'github\.com[:/]([^/]+)/([^/.]+)(?:\.git)?$',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, remote_url)
-            if match:
-                owner, repo = match.groups()
-                log(f"Auto-detected repo: {owner}/{repo}")
-                return owner, repo
-        
+        # Parse owner/repo from SSH or HTTPS GitHub URL formats
+        match = _REMOTE_RE.search(remote_url)
+        if match:
+            owner, repo = match.groups()
+            log(f"Auto-detected repo: {owner}/{repo}")
+            return owner, repo
+
         log(f"Could not parse GitHub repo from remote URL: {remote_url}")
         return None
     
@@ -77,220 +124,519 @@ def fetch_all_starred_repos(username: str, token: Optional[str] = None) -> List[
     else:
         log("Using unauthenticated requests (60 req/hour limit)")
     
-    all_repos = []
-    page = 1
     per_page = 100
-    
-    while True:
-        url = f"https://api.github.com/users/{username}/starred?per_page={per_page}&page={page}"
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            log(f"Error fetching stars: {response.status_code} - {response.text}")
-            if response.status_code == 403:
-                log("Rate limit exceeded. Consider adding GITHUB_TOKEN for higher limits.")
-            break
-        
-        repos = response.json()
-        if not repos:
-            break
-        
-        all_repos.extend(repos)
-        log(f"Fetched page {page}: {len(repos)} repos")
-        
-        if len(repos) < per_page:
-            break
-        
-        page += 1
-    
+
+    # Per-page ETag cache: unchanged pages come back as bodyless 304s that
+    # don't count against the rate limit, and we reuse the cached repos
+    cache = _load_cache()
+    page_cache = cache.setdefault("pages", {}).setdefault(username, {})
+    cached_page1 = page_cache.get("1", {})
+
+    # Incremental-sync state: the newest starred_at from the prior run plus
+    # the full list it produced
+    stars_cache = cache.get("stars", {}).get(username, {})
+    last_seen = stars_cache.get("last_seen", "")
+    prior_repos = stars_cache.get("repos", [])
+
+    # Fetch page 1 first - its Link header tells us the total page count
+    url = _starred_url(username, per_page, 1)
+    probe_headers = dict(headers)
+    if cached_page1.get("etag"):
+        probe_headers["If-None-Match"] = cached_page1["etag"]
+    response = SESSION.get(url, headers=probe_headers)
+
+    # On throttling, honor Retry-After instead of bailing and losing the run
+    if response.status_code in (403, 429):
+        wait = _retry_after_seconds(response)
+        log(f"⏳ Throttled ({response.status_code}), retrying in {wait}s...")
+        time.sleep(wait)
+        response = SESSION.get(url, headers=probe_headers)
+
+    fetch_remaining = True
+
+    if response.status_code == 304:
+        log("Page 1 unchanged, using cached copy")
+        all_repos = list(cached_page1.get("repos", []))
+        last_page = page_cache.get("last_page", 1)
+    elif response.status_code == 200:
+        all_repos = _slim_stars(_json_loads(response.content))
+        log(f"Fetched page 1: {len(all_repos)} repos")
+        last_page = _last_page_from_links(response.links)
+        page_cache["1"] = {"etag": response.headers.get("ETag"), "repos": all_repos}
+        page_cache["last_page"] = last_page
+
+        # Stars arrive newest-first, so if the oldest entry on page 1 was
+        # already seen last run, the delta fits entirely in page 1 - merge
+        # it onto the prior list and skip pages 2..N altogether. Only worth
+        # it when there are pages to skip: with a single page the fresh
+        # fetch already is the complete, unstar-accurate list
+        if last_page > 1 and last_seen and prior_repos and all_repos and all_repos[-1]["starred_at"] <= last_seen:
+            new_items = [item for item in all_repos if item["starred_at"] > last_seen]
+            log(f"Incremental sync: {len(new_items)} new stars since last run")
+            # A re-starred repo shows up in new_items with a fresh
+            # starred_at - drop its stale prior entry so it isn't duplicated
+            new_names = {item["repo"].get("full_name") for item in new_items}
+            all_repos = new_items + [
+                item for item in prior_repos
+                if item["repo"].get("full_name") not in new_names
+            ]
+            fetch_remaining = False
+    else:
+        log(f"Error fetching stars: {response.status_code} - {response.text}")
+        if response.status_code == 403:
+            log("Rate limit exceeded. Consider adding GITHUB_TOKEN for higher limits.")
+        return []
+
+    # Fetch remaining pages in parallel - page order is preserved by gather
+    if fetch_remaining and last_page > 1:
+        _wait_for_quota(response)
+        log(f"Fetching pages 2-{last_page} in parallel...")
+        pages = asyncio.run(_fetch_pages_async(username, headers, per_page, last_page, page_cache))
+        for page_repos in pages:
+            all_repos.extend(page_repos)
+
+    cache.setdefault("stars", {})[username] = {
+        "last_seen": all_repos[0]["starred_at"] if all_repos else last_seen,
+        "repos": all_repos
+    }
+    _save_cache(cache)
+
     log(f"Total starred repos fetched: {len(all_repos)}")
     return all_repos
 
-def generate_markdown(repos: List[Dict[str, Any]], username: str) -> str:
-    """Generate markdown content from starred repos"""
-    log("Generating markdown...")
-    
-    # Sort by starred_at date (most recent first) - chronological order
-    repos_sorted = sorted(repos, key=lambda x: x.get("starred_at", ""), reverse=True)
-    
-    md_content = f"""# {username}'s GitHub Stars
+# The only repo fields the markdown and Supermemory paths ever read;
+# GitHub sends ~30 more per repo that we can drop right after decode
+_REPO_FIELDS = ("full_name", "html_url", "description", "language", "stargazers_count", "topics")
+
+def _slim_stars(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Project each starred item down to the fields we actually use"""
+    slimmed = []
+    for item in items:
+        repo = item.get("repo", item)
+        slimmed.append({
+            "starred_at": item.get("starred_at", ""),
+            "repo": {key: repo[key] for key in _REPO_FIELDS if key in repo}
+        })
+    return slimmed
+
+def _retry_after_seconds(response: Any) -> int:
+    """Seconds to wait before retrying a throttled (403/429) response"""
+    return int(response.headers.get("Retry-After", "60"))
+
+def _wait_for_quota(response: Any):
+    """Sleep until the rate-limit window resets if we're about to run dry"""
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    if remaining is not None and int(remaining) <= 1:
+        reset = int(response.headers.get("X-RateLimit-Reset", "0"))
+        wait = max(0, reset - time.time()) + 1
+        log(f"⏳ Rate limit nearly exhausted, sleeping {wait:.0f}s until reset...")
+        time.sleep(wait)
+
+def _starred_url(username: str, per_page: int, page: int) -> str:
+    """Build the starred-repos API URL for a given page"""
+    return f"https://api.github.com/users/{username}/starred?per_page={per_page}&page={page}"
+
+def _last_page_from_links(links: Dict[str, Any]) -> int:
+    """Extract the last page number from a parsed Link header"""
+    last_url = links.get("last", {}).get("url", "")
+    match = re.search(r"[?&]page=(\d+)", last_url)
+    return int(match.group(1)) if match else 1
+
+async def _fetch_pages_async(username: str, headers: Dict[str, str], per_page: int, last_page: int,
+                             page_cache: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+    """Fetch pages 2..last_page concurrently, multiplexed over HTTP/2"""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+    # HTTP/2 carries all in-flight pages on one TCP+TLS connection, so
+    # pages 2..N skip the per-connection handshake entirely
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT_FETCHES)
+    async with httpx.AsyncClient(http2=True, headers=headers, limits=limits) as client:
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            cached = page_cache.get(str(page), {})
+            request_headers = {}
+            if cached.get("etag"):
+                request_headers["If-None-Match"] = cached["etag"]
 
-Last updated: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")} UTC
+            async with semaphore:
+                response = await client.get(
+                    _starred_url(username, per_page, page),
+                    headers=request_headers
+                )
+                if response.status_code in (403, 429):
+                    wait = _retry_after_seconds(response)
+                    log(f"⏳ Page {page} throttled, retrying in {wait}s...")
+                    await asyncio.sleep(wait)
+                    response = await client.get(
+                        _starred_url(username, per_page, page),
+                        headers=request_headers
+                    )
+                if response.status_code == 304:
+                    log(f"Page {page} unchanged, using cached copy")
+                    return cached.get("repos", [])
+                if response.status_code != 200:
+                    log(f"Error fetching page {page}: {response.status_code}")
+                    return []
+                repos = _slim_stars(_json_loads(response.content))
+                page_cache[str(page)] = {"etag": response.headers.get("ETag"), "repos": repos}
+                log(f"Fetched page {page}: {len(repos)} repos")
+                return repos
 
-Total stars: {len(repos)}
+        return await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1)))
+
+# Markdown templates, parsed once at import; each repo block renders with a
+# single format_map pass over a flat row dict
+_MD_HEADER_TPL = """# {username}'s GitHub Stars
+
+Last updated: {updated} UTC
+
+Total stars: {total}
 
 ---
 
 ## Recently Starred
 
 """
-    
-    for item in repos_sorted:
+
+_MD_REPO_TPL = """### [{full_name}]({html_url})
+⭐ {stars:,} | 🔤 {language} | 📅 Starred: {date}
+
+{description}
+
+"""
+
+_MD_TOPICS_TPL = "**Topics:** {topics}\n\n"
+
+def generate_markdown_chunks(repos: List[Dict[str, Any]], username: str) -> Iterator[str]:
+    """Yield the markdown document block by block, header first"""
+    # Sort by starred_at date (most recent first) - extract the key column
+    # once and argsort indices so the sort touches one flat list of strings
+    # instead of chasing a dict per comparison
+    starred_keys = [item.get("starred_at", "") for item in repos]
+    order = sorted(range(len(repos)), key=starred_keys.__getitem__, reverse=True)
+
+    yield _MD_HEADER_TPL.format_map({
+        "username": username,
+        "updated": RUN_TS.strftime("%Y-%m-%d %H:%M:%S"),
+        "total": len(repos)
+    })
+
+    for index in order:
+        item = repos[index]
         repo = item.get("repo", item)  # Handle different response formats
-        
-        name = repo.get("full_name", "Unknown")
-        url = repo.get("html_url", "")
-        description = repo.get("description", "No description provided")
-        language = repo.get("language", "Unknown")
-        stars = repo.get("stargazers_count", 0)
-        topics = repo.get("topics", [])
+        get = repo.get  # bind once - six lookups per row go through it
+        topics = get("topics", [])
         starred_at = item.get("starred_at", "Unknown")
-        
-        # Format starred date
-        if starred_at != "Unknown":
-            try:
-                starred_date = datetime.fromisoformat(starred_at.replace("Z", "+00:00"))
-                starred_at_fmt = starred_date.strftime("%Y-%m-%d")
-            except:
-                starred_at_fmt = starred_at
+
+        # GitHub always sends ISO8601 (YYYY-MM-DDTHH:MM:SSZ), so the
+        # first 10 chars are the date
+        if len(starred_at) >= 10 and starred_at[4] == "-":
+            starred_at_fmt = starred_at[:10]
         else:
             starred_at_fmt = "Unknown"
-        
-        md_content += f"""### [{name}]({url})
-⭐ {stars:,} | 🔤 {language} | 📅 Starred: {starred_at_fmt}
 
-{description}
-
-"""
+        yield _MD_REPO_TPL.format_map({
+            "full_name": get("full_name", "Unknown"),
+            "html_url": get("html_url", ""),
+            "description": get("description", "No description provided"),
+            "language": get("language", "Unknown"),
+            "stars": get("stargazers_count", 0),
+            "date": starred_at_fmt
+        })
         if topics:
-            md_content += f"**Topics:** {', '.join(topics)}\n\n"
-        
-        md_content += "---\n\n"
-    
-    return md_content
+            yield _MD_TOPICS_TPL.format_map({"topics": ", ".join(topics)})
 
-def save_markdown_locally(content: str, filename: str = "starred-repos.md"):
-    """Save markdown file locally"""
+        yield "---\n\n"
+
+def generate_markdown(repos: List[Dict[str, Any]], username: str) -> str:
+    """Generate markdown content from starred repos as one string"""
+    log("Generating markdown...")
+    return "".join(generate_markdown_chunks(repos, username))
+
+def save_markdown_locally(chunks: Iterable[str], filename: str = "starred-repos.md"):
+    """Stream markdown chunks to a local file"""
     log(f"Saving markdown to {filename}...")
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write(content)
+    with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(chunks)
     log(f"✅ Saved to {filename}")
 
+# Local cache between runs: per-file ETags and blob SHAs ("files"), per-page
+# ETags and bodies ("pages"), and the merged star list ("stars"). The star
+# data is deliberately stored twice - "pages" feeds the per-page 304 reuse
+# (each page must be replayable on its own, since pagination shifts when new
+# stars land) while "stars" feeds the incremental merge, whose output no
+# longer lines up with page boundaries. Keep the file out of version control
+# (it's in .gitignore) - it's machine-local state, not content.
+CACHE_FILE = ".openstar-cache.json"
+
+def _load_cache() -> Dict[str, Any]:
+    """Load the local run cache (empty dict if missing or unreadable)"""
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            return _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache: Dict[str, Any]):
+    """Persist the local run cache"""
+    try:
+        with open(CACHE_FILE, "wb") as f:
+            f.write(_json_dumps(cache))
+    except OSError as e:
+        log(f"⚠️ Could not write {CACHE_FILE}: {e}")
+
+def _remote_blob_sha(owner: str, repo: str, file_path: str, headers: Dict[str, str], branch: str = "main") -> Optional[str]:
+    """Look up a file's blob SHA via the Git Data API - no content download"""
+    base = f"https://api.github.com/repos/{owner}/{repo}"
+
+    response = SESSION.get(f"{base}/git/ref/heads/{branch}", headers=headers)
+    if response.status_code != 200:
+        return None
+    commit_sha = _json_loads(response.content)["object"]["sha"]
+
+    response = SESSION.get(f"{base}/git/commits/{commit_sha}", headers=headers)
+    if response.status_code != 200:
+        return None
+    tree_sha = _json_loads(response.content)["tree"]["sha"]
+
+    response = SESSION.get(f"{base}/git/trees/{tree_sha}", headers=headers)
+    if response.status_code != 200:
+        return None
+
+    for entry in _json_loads(response.content).get("tree", []):
+        if entry.get("path") == file_path:
+            return entry.get("sha")
+    return None
+
 def update_github_file(owner: str, repo: str, content: str, token: str, file_path: str = "starred-repos.md"):
     """Update or create file in GitHub repository"""
     log(f"Committing {file_path} to {owner}/{repo}...")
-    
+
     if not token:
         raise ValueError("GITHUB_TOKEN is required for auto-commit mode")
-    
+
     headers = {
         "Authorization": f"token {token}",
         "Accept": "application/vnd.github.v3+json"
     }
-    
-    # Check if file exists to get SHA
+
+    cache = _load_cache()
+    cache_key = f"{owner}/{repo}/{file_path}"
+    cached = cache.get("files", {}).get(cache_key, {})
+
     url = f"https://api.github.com/repos/{owner}/{repo}/contents/{file_path}"
-    response = requests.get(url, headers=headers)
-    
-    sha = None
-    if response.status_code == 200:
-        sha = response.json().get("sha")
-        log(f"File exists, updating (SHA: {sha[:7]}...)")
+
+    # The PUT only needs the existing blob SHA. Prefer the one cached from
+    # the last run; on a miss, resolve it through the Git Data API
+    # (ref -> commit -> tree), which never transfers the file body
+    sha = cached.get("sha")
+    if sha:
+        log(f"Using cached SHA: {sha[:7]}...")
     else:
-        log("File doesn't exist, creating new file")
-    
+        sha = _remote_blob_sha(owner, repo, file_path, headers)
+        if sha:
+            cache.setdefault("files", {})[cache_key] = {"sha": sha}
+            log(f"File exists, updating (SHA: {sha[:7]}...)")
+        else:
+            log("File doesn't exist, creating new file")
+
     # Prepare content
-    content_base64 = base64.b64encode(content.encode()).decode()
-    
+    content_bytes = content.encode()
+
+    # Git blob SHA of the new content: sha1("blob <len>\0" + bytes).
+    # If it matches the remote SHA nothing changed - skip the PUT entirely
+    local_sha = hashlib.sha1(f"blob {len(content_bytes)}\0".encode() + content_bytes).hexdigest()
+    if sha and sha == local_sha:
+        log("✅ No changes, skipping commit")
+        _save_cache(cache)
+        return True
+
+    # base64 output is pure ASCII - decode accordingly, orjson re-encodes
+    # it straight back to bytes in the single dumps pass below
+    content_base64 = base64.b64encode(content_bytes).decode("ascii")
+
     payload = {
-        "message": f"Update starred repos - {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC",
+        "message": f"Update starred repos - {RUN_TS.strftime('%Y-%m-%d %H:%M:%S')} UTC",
         "content": content_base64,
         "branch": "main"
     }
     
     if sha:
         payload["sha"] = sha
-    
+
     # Update file
-    response = requests.put(url, headers=headers, json=payload)
-    
+    # Serialize once with orjson instead of requests' internal json.dumps
+    response = SESSION.put(
+        url,
+        headers={**headers, "Content-Type": "application/json"},
+        data=_json_dumps(payload)
+    )
+
+    # A stale cached SHA gets a 409/422 conflict - re-resolve the current
+    # SHA and retry the PUT once
+    if response.status_code in (409, 422):
+        log(f"SHA conflict ({response.status_code}), refetching and retrying...")
+        sha = _remote_blob_sha(owner, repo, file_path, headers)
+        if sha:
+            payload["sha"] = sha
+            cache.setdefault("files", {})[cache_key] = {"sha": sha}
+        else:
+            payload.pop("sha", None)
+        response = SESSION.put(
+            url,
+            headers={**headers, "Content-Type": "application/json"},
+            data=_json_dumps(payload)
+        )
+
     if response.status_code in [200, 201]:
         log("✅ File committed successfully")
-        result = response.json()
+        result = _json_loads(response.content)
         commit_url = result.get("commit", {}).get("html_url", "")
         log(f"Commit: {commit_url}")
+
+        # Remember the new blob SHA for the next run's probe
+        new_sha = result.get("content", {}).get("sha")
+        if new_sha:
+            cache.setdefault("files", {}).setdefault(cache_key, {})["sha"] = new_sha
+        _save_cache(cache)
         return True
     else:
         log(f"❌ Error committing file: {response.status_code} - {response.text}")
         return False
 
+# Concurrent Supermemory uploads (I/O-bound, so threads fan out the RTTs)
+SUPERMEMORY_MAX_WORKERS = 16
+
+# Repos per batch POST - amortizes request overhead across many entries
+SUPERMEMORY_BATCH_SIZE = 50
+
+def _build_supermemory_payload(item: Dict[str, Any], username: str) -> Dict[str, Any]:
+    """Build the Supermemory /add payload for one starred repo"""
+    repo = item.get("repo", item)
+
+    # Prepare content for Supermemory
+    name = repo.get("full_name", "Unknown")
+    description = repo.get("description") or "No description"
+    url = repo.get("html_url", "")
+    language = repo.get("language") or "Unknown"
+    topics = repo.get("topics", [])
+    stars = repo.get("stargazers_count", 0)
+    starred_at = item.get("starred_at", "")
+
+    # Create rich content for semantic search
+    content = f"""GitHub Repository: {name}
+
+{description}
+
+Programming Language: {language}
+Stars: {stars:,}
+Topics: {', '.join(topics) if topics else 'None'}
+Starred by @{username} on {starred_at}
+
+URL: {url}
+"""
+
+    # Supermemory API payload
+    # Based on Supermemory API docs: https://docs.supermemory.ai
+    return {
+        "content": content,
+        "type": "document",
+        "metadata": {
+            "title": name,
+            "url": url,
+            "source": "github-stars",
+            "language": language,
+            "topics": topics,
+            "stars": stars,
+            "starred_at": starred_at,
+            "starred_by": username
+        }
+    }
+
 def sync_to_supermemory(repos: List[Dict[str, Any]], username: str) -> int:
     """Sync starred repos to Supermemory knowledge graph"""
     if not SUPERMEMORY_API_KEY:
         log("ℹ️  SUPERMEMORY_API_KEY not set, skipping Supermemory sync")
         return 0
-    
+
     log(f"Syncing {len(repos)} repos to Supermemory...")
-    
+
     headers = {
         "Authorization": f"Bearer {SUPERMEMORY_API_KEY}",
         "Content-Type": "application/json"
     }
-    
-    success_count = 0
-    failed_count = 0
-    
-    for item in repos:
-        repo = item.get("repo", item)
-        
-        # Prepare content for Supermemory
-        name = repo.get("full_name", "Unknown")
-        description = repo.get("description") or "No description"
-        url = repo.get("html_url", "")
-        language = repo.get("language") or "Unknown"
-        topics = repo.get("topics", [])
-        stars = repo.get("stargazers_count", 0)
-        starred_at = item.get("starred_at", "")
-        
-        # Create rich content for semantic search
-        content = f"""GitHub Repository: {name}
 
-{description}
+    payloads = [_build_supermemory_payload(item, username) for item in repos]
 
-Programming Language: {language}
-Stars: {stars:,}
-Topics: {', '.join(topics) if topics else 'None'}
-Starred by @{username} on {starred_at}
+    if not payloads:
+        log("✅ Supermemory sync complete: 0 success, 0 failed")
+        return 0
+
+    def _post_one(payload: Dict[str, Any]) -> bool:
+        name = payload["metadata"]["title"]
 
-URL: {url}
-"""
-        
-        # Supermemory API payload
-        # Based on Supermemory API docs: https://docs.supermemory.ai
-        payload = {
-            "content": content,
-            "type": "document",
-            "metadata": {
-                "title": name,
-                "url": url,
-                "source": "github-stars",
-                "language": language,
-                "topics": topics,
-                "stars": stars,
-                "starred_at": starred_at,
-                "starred_by": username
-            }
-        }
-        
         try:
-            # Add to Supermemory
-            response = requests.post(
+            # Add to Supermemory. Single-shot on purpose: the adapter's Retry
+            # doesn't cover POST, and retrying a timed-out /add could create
+            # duplicate documents since the endpoint isn't idempotent
+            response = SESSION.post(
                 f"{SUPERMEMORY_API_URL}/add",
                 headers=headers,
-                json=payload,
+                data=_json_dumps(payload),
                 timeout=10
             )
-            
+
             if response.status_code in [200, 201]:
-                success_count += 1
-            else:
-                failed_count += 1
-                log(f"  ⚠️ Failed to sync {name}: {response.status_code}")
-        
+                return True
+
+            log(f"  ⚠️ Failed to sync {name}: {response.status_code}")
+            return False
+
         except Exception as e:
-            failed_count += 1
             log(f"  ⚠️ Error syncing {name}: {str(e)}")
-    
+            return False
+
+    def _post_batch(batch: List[Dict[str, Any]]) -> int:
+        """POST one batch; returns successes, or -1 if the endpoint is unsupported"""
+        try:
+            response = SESSION.post(
+                f"{SUPERMEMORY_API_URL}/batch",
+                headers=headers,
+                data=_json_dumps({"items": batch}),
+                timeout=30
+            )
+
+            if response.status_code in [404, 405]:
+                return -1
+
+            if response.status_code in [200, 201]:
+                return len(batch)
+
+            log(f"  ⚠️ Failed to sync batch of {len(batch)}: {response.status_code}")
+            return 0
+
+        except Exception as e:
+            log(f"  ⚠️ Error syncing batch of {len(batch)}: {str(e)}")
+            return 0
+
+    batches = [
+        payloads[i:i + SUPERMEMORY_BATCH_SIZE]
+        for i in range(0, len(payloads), SUPERMEMORY_BATCH_SIZE)
+    ]
+
+    # Probe the batch endpoint with the first chunk; not every deployment has it
+    first_result = _post_batch(batches[0])
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=SUPERMEMORY_MAX_WORKERS) as executor:
+        if first_result == -1:
+            log("Batch endpoint unavailable, falling back to per-repo POSTs")
+            success_count = sum(executor.map(_post_one, payloads))
+        else:
+            success_count = first_result + sum(
+                max(result, 0) for result in executor.map(_post_batch, batches[1:])
+            )
+
+    failed_count = len(payloads) - success_count
+
     log(f"✅ Supermemory sync complete: {success_count} success, {failed_count} failed")
     return success_count
 
@@ -333,11 +679,15 @@ def main():
             log("❌ No starred repos found")
             return
         
-        # 2. Generate markdown
-        markdown_content = generate_markdown(repos, GITHUB_USERNAME)
-        
-        # 3. Save locally (always)
-        save_markdown_locally(markdown_content)
+        # 2./3. Generate markdown and save locally (always). The commit path
+        # needs the whole document anyway (blob SHA + base64), so only
+        # local-only runs stream blocks straight to disk
+        if auto_commit_mode:
+            markdown_content = generate_markdown(repos, GITHUB_USERNAME)
+            save_markdown_locally([markdown_content])
+        else:
+            log("Generating markdown...")
+            save_markdown_locally(generate_markdown_chunks(repos, GITHUB_USERNAME))
         
         # 4. Commit to GitHub (if in auto-commit mode)
         if auto_commit_mode:
@@ -374,6 +724,8 @@ def main():
     except Exception as e:
         log(f"❌ Error: {str(e)}")
         raise
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
     main()